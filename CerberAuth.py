@@ -4,18 +4,37 @@ A secure Flask-based license validation system with admin management
 """
 
 import os
+
+PRODUCTION = os.environ.get("CERBER_PRODUCTION", "").lower() in ("1", "true", "yes")
+if PRODUCTION:
+    import gevent
+    from gevent import monkey
+    monkey.patch_all()
+
 import json
+import queue
 import uuid
 import hashlib
+import hmac
+import itertools
 import secrets
 import sqlite3
+import signal
+import sys
+import atexit
 import platform
 import subprocess
+from collections import namedtuple
 from datetime import datetime, timedelta
-from functools import wraps
-from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import Dict, Any, Callable, Iterator, Optional, Set, Tuple
 
+import orjson
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 from flask import Flask, request, jsonify
 from rich.console import Console
 from rich.panel import Panel
@@ -29,15 +48,68 @@ import time
 
 console = Console()
 
+INSERT_USAGE_SQL = (
+    "INSERT INTO usage_logs (license_key, ip_address, user_agent, hwid, geo_country, timestamp) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+USAGE_LOG_RETRIES = 3
+
+def run_blocking(fn: Callable, *args):
+    if PRODUCTION:
+        return gevent.get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
+License = namedtuple('License', 'key hwid expires_at expires_at_epoch plan')
+UsageInfo = namedtuple('UsageInfo', 'ip user_agent hwid geo_country first_login last_login login_count')
+
 class LicenseDB:
     
-    def __init__(self, db_path: str = "licenses.db"):
+    def __init__(self, db_path: str = "licenses.db", pool_size: int = 8):
         self.db_path = db_path
         self.init_database()
+        
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        
+        self._write_conn = self._connect()
+        self._write_lock = threading.Lock()
+        
+        self._cache: TTLCache = TTLCache(maxsize=100_000, ttl=300)
+        self._cache_lock = threading.RLock()
+        self._invalidations = 0
+        
+        self._log_q: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._dropped_rows = 0
+        self._log_thread = threading.Thread(target=self._flush_usage_logs_loop, daemon=True)
+        self._log_thread.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            yield self._write_conn
     
     def init_database(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS licenses (
@@ -62,182 +134,327 @@ class LicenseDB:
             )
         ''')
         
-        conn.commit()
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_usage_license_ts ON usage_logs (license_key, timestamp)"
+        )
+        
         conn.close()
     
     def add_license(self, key: str, hwid: str, expires_at: str, plan: str = "basic") -> bool:
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO licenses (key, hwid, expires_at, plan) VALUES (?, ?, ?, ?)",
-                (key, hwid, expires_at, plan)
-            )
-            conn.commit()
-            conn.close()
+            with self._writer() as conn:
+                run_blocking(
+                    conn.execute,
+                    "INSERT INTO licenses (key, hwid, expires_at, plan) VALUES (?, ?, ?, ?)",
+                    (key, hwid, expires_at, plan)
+                )
+            self._invalidate(key)
             return True
         except sqlite3.IntegrityError:
             return False
     
-    def get_license(self, key: str) -> Optional[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT key, hwid, expires_at, plan FROM licenses WHERE key = ?",
-            (key,)
-        )
-        result = cursor.fetchone()
-        conn.close()
+    def _invalidate(self, key: str):
+        with self._cache_lock:
+            self._invalidations += 1
+            self._cache.pop(key, None)
+    
+    def get_license(self, key: str) -> Optional[License]:
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            invalidations = self._invalidations
+        if cached is not None:
+            return cached
+        
+        with self._conn() as conn:
+            result = run_blocking(lambda: conn.execute(
+                "SELECT key, hwid, expires_at, plan FROM licenses WHERE key = ?",
+                (key,)
+            ).fetchone())
         
         if result:
-            return {
-                "key": result[0],
-                "hwid": result[1],
-                "expires_at": result[2],
-                "plan": result[3]
-            }
+            license_info = License(result[0], result[1], result[2], expiry_epoch(result[2]), result[3])
+            with self._cache_lock:
+                if self._invalidations == invalidations:
+                    self._cache[key] = license_info
+            return license_info
         return None
     
     def delete_license(self, key: str) -> bool:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM licenses WHERE key = ?", (key,))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with self._writer() as conn:
+            affected = run_blocking(conn.execute, "DELETE FROM licenses WHERE key = ?", (key,)).rowcount
+        self._invalidate(key)
         return affected > 0
     
     def reset_hwid(self, key: str) -> bool:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE licenses SET hwid = NULL WHERE key = ?", (key,))
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        with self._writer() as conn:
+            affected = run_blocking(conn.execute, "UPDATE licenses SET hwid = NULL WHERE key = ?", (key,)).rowcount
+        self._invalidate(key)
+        return affected > 0
+    
+    def bind_hwid(self, key: str, hwid: str) -> bool:
+        with self._writer() as conn:
+            affected = run_blocking(
+                conn.execute,
+                "UPDATE licenses SET hwid = ? WHERE key = ? AND hwid IS NULL",
+                (hwid, key)
+            ).rowcount
+        self._invalidate(key)
         return affected > 0
     
     def log_usage(self, license_key: str, ip: str, user_agent: str, hwid: str, geo_country: str = "Unknown"):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO usage_logs (license_key, ip_address, user_agent, hwid, geo_country) VALUES (?, ?, ?, ?, ?)",
-            (license_key, ip, user_agent, hwid, geo_country)
-        )
-        conn.commit()
-        conn.close()
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        self._log_q.put((license_key, ip, user_agent, hwid, geo_country, timestamp))
     
-    def get_usage_info(self, license_key: str) -> Optional[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def flush_usage_logs(self, timeout: float = 5.0) -> bool:
+        dropped = self._dropped_rows
+        done = threading.Event()
+        self._log_q.put(done)
+        return done.wait(timeout) and self._dropped_rows == dropped
+    
+    def _drain_usage_logs(self, max_rows: int = 500, max_wait: float = 0.1) -> Tuple[list, list]:
+        rows, waiters = [], []
+        item = self._log_q.get()
+        deadline = time.monotonic() + max_wait
+        while True:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break
+            rows.append(item)
+            remaining = deadline - time.monotonic()
+            if len(rows) >= max_rows or remaining <= 0:
+                break
+            try:
+                item = self._log_q.get(timeout=remaining)
+            except queue.Empty:
+                break
+        return rows, waiters
+    
+    @staticmethod
+    def _insert_usage_rows(conn: sqlite3.Connection, rows: list):
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(INSERT_USAGE_SQL, rows)
+            conn.execute("COMMIT")
+        except:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _write_usage_logs(self, rows: list):
+        for attempt in range(1, USAGE_LOG_RETRIES + 1):
+            try:
+                with self._writer() as conn:
+                    run_blocking(self._insert_usage_rows, conn, rows)
+                return
+            except sqlite3.OperationalError:
+                if attempt == USAGE_LOG_RETRIES:
+                    break
+                time.sleep(0.1 * attempt)
+            except Exception:
+                break
         
-        cursor.execute('''
-            SELECT 
-                ip_address, user_agent, hwid, geo_country,
-                MIN(timestamp) as first_login,
-                MAX(timestamp) as last_login,
-                COUNT(*) as login_count
-            FROM usage_logs 
+        dropped, error = 0, None
+        for index, row in enumerate(rows):
+            try:
+                with self._writer() as conn:
+                    run_blocking(self._insert_usage_rows, conn, [row])
+            except sqlite3.OperationalError as e:
+                dropped, error = dropped + len(rows) - index, e
+                break
+            except Exception as e:
+                dropped, error = dropped + 1, e
+        
+        if dropped:
+            self._dropped_rows += dropped
+            console.print(f"[bold red]Dropped {dropped} usage log rows: {error}[/bold red]")
+    
+    def _flush_usage_logs_loop(self):
+        while True:
+            rows, waiters = self._drain_usage_logs()
+            try:
+                if rows:
+                    self._write_usage_logs(rows)
+            except Exception as e:
+                self._dropped_rows += len(rows)
+                console.print(f"[bold red]Usage log flush failed: {e}[/bold red]")
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+    
+    def verify_and_log(self, key: str, hwid: str, ip: str, user_agent: str, geo_lookup: Optional[Callable[[str], str]] = None) -> Tuple[str, Optional[License]]:
+        license_info = self.get_license(key)
+        if not license_info:
+            return "not_found", None
+        
+        if is_expired(license_info.expires_at_epoch):
+            return "expired", license_info
+        
+        if license_info.hwid is not None and license_info.hwid != hwid:
+            return "hwid_mismatch", license_info
+        
+        if license_info.hwid is None:
+            if not self.bind_hwid(key, hwid):
+                return self.verify_and_log(key, hwid, ip, user_agent, geo_lookup)
+            license_info = license_info._replace(hwid=hwid)
+        
+        geo_country = geo_lookup(ip) if geo_lookup else "Unknown"
+        self.log_usage(key, ip, user_agent, hwid, geo_country)
+        return "valid", license_info
+    
+    @staticmethod
+    def _query_usage_info(conn: sqlite3.Connection, license_key: str) -> Optional[UsageInfo]:
+        last = conn.execute('''
+            SELECT ip_address, user_agent, hwid, geo_country, timestamp
+            FROM usage_logs
             WHERE license_key = ?
-            GROUP BY license_key
-        ''', (license_key,))
+            ORDER BY timestamp DESC, id DESC
+            LIMIT 1
+        ''', (license_key,)).fetchone()
+        if not last:
+            return None
         
-        result = cursor.fetchone()
-        conn.close()
+        first_login, login_count = conn.execute(
+            "SELECT MIN(timestamp), COUNT(*) FROM usage_logs WHERE license_key = ?",
+            (license_key,)
+        ).fetchone()
         
-        if result:
-            return {
-                "ip": result[0],
-                "user_agent": result[1],
-                "hwid": result[2],
-                "geo_country": result[3],
-                "first_login": result[4],
-                "last_login": result[5],
-                "login_count": result[6]
-            }
-        return None
+        return UsageInfo(last[0], last[1], last[2], last[3], first_login, last[4], login_count)
+    
+    def get_usage_info(self, license_key: str) -> Optional[UsageInfo]:
+        with self._conn() as conn:
+            return run_blocking(self._query_usage_info, conn, license_key)
+
+@lru_cache(maxsize=1)
+def _cpu_serial() -> str:
+    try:
+        system = platform.system()
+        if system == "Windows":
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\CentralProcessor\0") as key:
+                identifier = winreg.QueryValueEx(key, "Identifier")[0]
+                name = winreg.QueryValueEx(key, "ProcessorNameString")[0]
+            return hashlib.md5(f"{identifier}{name}".encode()).hexdigest()[:16]
+        elif system == "Linux":
+            with open('/proc/cpuinfo', 'r') as f:
+                for line in f:
+                    if 'Serial' in line or 'processor' in line:
+                        return hashlib.md5(line.encode()).hexdigest()[:16]
+        elif system == "Darwin":  
+            result = subprocess.run(
+                ['sysctl', '-n', 'machdep.cpu.brand_string'],
+                capture_output=True, text=True, timeout=1
+            )
+            return hashlib.md5(result.stdout.encode()).hexdigest()[:16]
+    except:
+        pass
+    
+    system_info = f"{platform.node()}{platform.processor()}{platform.machine()}"
+    return hashlib.md5(system_info.encode()).hexdigest()[:16]
 
 class SystemInfo:
     
     @staticmethod
     def get_cpu_serial() -> str:
-        try:
-            system = platform.system()
-            if system == "Windows":
-                result = subprocess.run(
-                    ['wmic', 'cpu', 'get', 'ProcessorId', '/value'],
-                    capture_output=True, text=True, timeout=5
-                )
-                for line in result.stdout.split('\n'):
-                    if 'ProcessorId=' in line:
-                        return line.split('=')[1].strip()
-            elif system == "Linux":
-                with open('/proc/cpuinfo', 'r') as f:
-                    for line in f:
-                        if 'Serial' in line or 'processor' in line:
-                            return hashlib.md5(line.encode()).hexdigest()[:16]
-            elif system == "Darwin":  
-                result = subprocess.run(
-                    ['system_profiler', 'SPHardwareDataType'],
-                    capture_output=True, text=True, timeout=5
-                )
-                return hashlib.md5(result.stdout.encode()).hexdigest()[:16]
-        except:
-            pass
-        
-        system_info = f"{platform.node()}{platform.processor()}{platform.machine()}"
-        return hashlib.md5(system_info.encode()).hexdigest()[:16]
+        return _cpu_serial()
 
 class GeoLocation:
     
-    @staticmethod
-    def get_country(ip: str) -> str:
+    CACHE_TTL = 24 * 60 * 60
+    FAILURE_TTL = 5 * 60
+    CACHE_SIZE = 50_000
+    MAX_PENDING = 256
+    
+    _cache: Dict[str, Tuple[str, float]] = {}
+    _pending: Set[str] = set()
+    _lock = threading.Lock()
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="geo")
+    _session = requests.Session()
+    _session.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+    
+    @classmethod
+    def get_country(cls, ip: str) -> str:
+        cached = cls._cache.get(ip)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        
+        with cls._lock:
+            if ip not in cls._pending and len(cls._pending) < cls.MAX_PENDING:
+                cls._pending.add(ip)
+                cls._executor.submit(cls._fetch_country, ip)
+        return 'Unknown'
+    
+    @classmethod
+    def _store(cls, ip: str, country: str, ttl: float):
+        with cls._lock:
+            cls._cache.pop(ip, None)
+            if len(cls._cache) >= cls.CACHE_SIZE:
+                cls._cache.pop(next(iter(cls._cache)))
+            cls._cache[ip] = (country, time.time() + ttl)
+    
+    @classmethod
+    def _fetch_country(cls, ip: str):
+        country, ttl = 'Unknown', cls.FAILURE_TTL
         try:
-            response = requests.get(f"http://ip-api.com/json/{ip}", timeout=2)
+            response = cls._session.get(f"http://ip-api.com/json/{ip}", timeout=(0.5, 1.5))
             if response.status_code == 200:
-                data = response.json()
-                return data.get('countryCode', 'Unknown')
+                country, ttl = response.json().get('countryCode', 'Unknown'), cls.CACHE_TTL
         except:
             pass
-        return 'Unknown'
+        finally:
+            cls._store(ip, country, ttl)
+            with cls._lock:
+                cls._pending.discard(ip)
 
 class APIStats:
     
     def __init__(self):
         self.start_time = datetime.now()
-        self.request_count = 0
-        self.verify_requests = 0
-        self.admin_requests = 0
-        self.error_count = 0
+        self._request_count = itertools.count()
+        self._verify_requests = itertools.count()
+        self._admin_requests = itertools.count()
+        self._error_count = itertools.count()
+        self._snapshots = 0
         self.active_licenses = 0
         self.lock = threading.Lock()
+        self.changed = threading.Event()
     
     def increment_request(self, endpoint_type: str = "general"):
-        with self.lock:
-            self.request_count += 1
-            if endpoint_type == "verify":
-                self.verify_requests += 1
-            elif endpoint_type == "admin":
-                self.admin_requests += 1
+        next(self._request_count)
+        if endpoint_type == "verify":
+            next(self._verify_requests)
+        elif endpoint_type == "admin":
+            next(self._admin_requests)
+        if not self.changed.is_set():
+            self.changed.set()
     
     def increment_error(self):
-        with self.lock:
-            self.error_count += 1
+        next(self._error_count)
+        if not self.changed.is_set():
+            self.changed.set()
+    
+    def get_uptime(self) -> str:
+        return str(datetime.now() - self.start_time).split('.')[0]
     
     def get_stats(self) -> Dict:
         with self.lock:
-            uptime = datetime.now() - self.start_time
-            return {
-                "uptime": str(uptime).split('.')[0],
-                "total_requests": self.request_count,
-                "verify_requests": self.verify_requests,
-                "admin_requests": self.admin_requests,
-                "error_count": self.error_count,
-                "success_rate": f"{((self.request_count - self.error_count) / max(self.request_count, 1) * 100):.1f}%"
-            }
+            request_count = next(self._request_count) - self._snapshots
+            verify_requests = next(self._verify_requests) - self._snapshots
+            admin_requests = next(self._admin_requests) - self._snapshots
+            error_count = next(self._error_count) - self._snapshots
+            self._snapshots += 1
+        
+        return {
+            "uptime": self.get_uptime(),
+            "total_requests": request_count,
+            "verify_requests": verify_requests,
+            "admin_requests": admin_requests,
+            "error_count": error_count,
+            "success_rate": f"{((request_count - error_count) / max(request_count, 1) * 100):.1f}%"
+        }
 
 db = LicenseDB()
 stats = APIStats()
 admin_key = secrets.token_urlsafe(32)
+ADMIN_KEY_B = admin_key.encode()
 app = Flask(__name__)
 
 def require_admin_key(f):
@@ -248,8 +465,7 @@ def require_admin_key(f):
             stats.increment_error()
             return jsonify({"error": "Missing or invalid authorization header"}), 401
         
-        token = auth_header.split(' ')[1]
-        if token != admin_key:
+        if not hmac.compare_digest(auth_header[7:].encode(), ADMIN_KEY_B):
             stats.increment_error()
             return jsonify({"error": "Invalid admin key"}), 401
         
@@ -257,57 +473,69 @@ def require_admin_key(f):
         return f(*args, **kwargs)
     return decorated_function
 
+VERIFY_FIELDS = ('key', 'hwid')
+GENERATE_FIELDS = ('expires_at', 'hwid')
+KEY_FIELDS = ('key',)
+
+def parse_required(required: Tuple[str, ...]) -> Optional[Dict]:
+    try:
+        data = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+    
+    if not isinstance(data, dict):
+        return None
+    for field in required:
+        if field not in data:
+            return None
+    return data
+
 def generate_license_key() -> str:
     return f"LIC-{secrets.token_urlsafe(16).upper()}"
 
-def is_expired(expires_at: str) -> bool:
+def expiry_epoch(expires_at: str) -> int:
     try:
-        expiry_date = datetime.strptime(expires_at, "%Y-%m-%d")
-        return datetime.now() > expiry_date
+        return int(datetime.strptime(expires_at, "%Y-%m-%d").timestamp())
     except:
-        return True
+        return 0
+
+def is_expired(expires_epoch: int) -> bool:
+    return time.time() > expires_epoch
 
 @app.route('/verify', methods=['POST'])
 def verify_license():
     try:
-        data = request.get_json()
-        if not data or 'key' not in data or 'hwid' not in data:
+        data = parse_required(VERIFY_FIELDS)
+        if data is None:
             stats.increment_error()
             return jsonify({"error": "Missing required fields"}), 400
         
         license_key = data['key']
         hwid = data['hwid']
         
-        license_info = db.get_license(license_key)
-        if not license_info:
+        forwarded_for = request.environ.get('HTTP_X_FORWARDED_FOR')
+        ip = forwarded_for.split(',', 1)[0].strip() if forwarded_for else request.remote_addr
+        user_agent = request.headers.get('User-Agent', 'Unknown')
+        
+        status, license_info = db.verify_and_log(license_key, hwid, ip, user_agent, GeoLocation.get_country)
+        if status == "not_found":
             stats.increment_error()
             return jsonify({"error": "Key not found"}), 401
-
-        if is_expired(license_info['expires_at']):
+        
+        if status == "expired":
             stats.increment_error()
             return jsonify({"error": "License expired"}), 410
         
-        if license_info['hwid'] is None:
-            conn = sqlite3.connect(db.db_path)
-            cursor = conn.cursor()
-            cursor.execute("UPDATE licenses SET hwid = ? WHERE key = ?", (hwid, license_key))
-            conn.commit()
-            conn.close()
-        elif license_info['hwid'] != hwid:
+        if status == "hwid_mismatch":
             stats.increment_error()
             return jsonify({"error": "HWID mismatch"}), 403
         
-        ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-        user_agent = request.headers.get('User-Agent', 'Unknown')
-        geo_country = GeoLocation.get_country(ip)
-        
-        db.log_usage(license_key, ip, user_agent, hwid, geo_country)
         stats.increment_request("verify")
         
         return jsonify({
             "valid": True,
-            "expires_at": license_info['expires_at'],
-            "plan": license_info['plan']
+            "expires_at": license_info.expires_at,
+            "plan": license_info.plan
         })
         
     except Exception as e:
@@ -318,8 +546,8 @@ def verify_license():
 @require_admin_key
 def generate_license():
     try:
-        data = request.get_json()
-        if not data or 'expires_at' not in data or 'hwid' not in data:
+        data = parse_required(GENERATE_FIELDS)
+        if data is None:
             stats.increment_error()
             return jsonify({"error": "Missing required fields"}), 400
         
@@ -349,8 +577,8 @@ def generate_license():
 @require_admin_key
 def delete_license():
     try:
-        data = request.get_json()
-        if not data or 'key' not in data:
+        data = parse_required(KEY_FIELDS)
+        if data is None:
             stats.increment_error()
             return jsonify({"error": "Missing license key"}), 400
         
@@ -368,8 +596,8 @@ def delete_license():
 @require_admin_key
 def reset_hwid():
     try:
-        data = request.get_json()
-        if not data or 'key' not in data:
+        data = parse_required(KEY_FIELDS)
+        if data is None:
             stats.increment_error()
             return jsonify({"error": "Missing license key"}), 400
         
@@ -396,7 +624,7 @@ def get_key_info():
         if not usage_info:
             return jsonify({"message": "no key info"})
         
-        return jsonify(usage_info)
+        return jsonify(usage_info._asdict())
         
     except Exception as e:
         stats.increment_error()
@@ -416,12 +644,6 @@ def create_dashboard():
         Layout(name="right")
     )
     
-    return layout
-
-def update_dashboard(layout):
-    current_stats = stats.get_stats()
-    cpu_serial = SystemInfo.get_cpu_serial()
-    
     header_text = Text("🔐 License Key Authentication API Server", style="bold blue")
     header_panel = Panel(
         header_text,
@@ -429,16 +651,25 @@ def update_dashboard(layout):
         style="bright_blue"
     )
     layout["header"].update(header_panel)
-
+    
+    layout.cells = {
+        "uptime": Text(),
+        "total_requests": Text(),
+        "verify_requests": Text(),
+        "admin_requests": Text(),
+        "error_count": Text(),
+        "success_rate": Text()
+    }
+    
     system_table = Table(show_header=False, box=box.ROUNDED)
     system_table.add_column("Property", style="cyan")
     system_table.add_column("Value", style="green")
     
     system_table.add_row("🖥️  System", f"{platform.system()} {platform.release()}")
-    system_table.add_row("🔧 CPU Serial", cpu_serial)
+    system_table.add_row("🔧 CPU Serial", SystemInfo.get_cpu_serial())
     system_table.add_row("🌐 Host", "localhost:5000")
     system_table.add_row("⏰ Started", stats.start_time.strftime("%Y-%m-%d %H:%M:%S"))
-    system_table.add_row("📊 Uptime", current_stats["uptime"])
+    system_table.add_row("📊 Uptime", layout.cells["uptime"])
     
     system_panel = Panel(
         system_table,
@@ -446,16 +677,16 @@ def update_dashboard(layout):
         border_style="green"
     )
     layout["left"].update(system_panel)
-
+    
     stats_table = Table(show_header=False, box=box.ROUNDED)
     stats_table.add_column("Metric", style="cyan")
     stats_table.add_column("Value", style="yellow")
     
-    stats_table.add_row("📈 Total Requests", str(current_stats["total_requests"]))
-    stats_table.add_row("✅ Verify Requests", str(current_stats["verify_requests"]))
-    stats_table.add_row("🔧 Admin Requests", str(current_stats["admin_requests"]))
-    stats_table.add_row("❌ Errors", str(current_stats["error_count"]))
-    stats_table.add_row("📊 Success Rate", current_stats["success_rate"])
+    stats_table.add_row("📈 Total Requests", layout.cells["total_requests"])
+    stats_table.add_row("✅ Verify Requests", layout.cells["verify_requests"])
+    stats_table.add_row("🔧 Admin Requests", layout.cells["admin_requests"])
+    stats_table.add_row("❌ Errors", layout.cells["error_count"])
+    stats_table.add_row("📊 Success Rate", layout.cells["success_rate"])
     
     stats_panel = Panel(
         stats_table,
@@ -471,14 +702,30 @@ def update_dashboard(layout):
         border_style="red"
     )
     layout["footer"].update(footer_panel)
+    
+    update_dashboard(layout)
+    return layout
+
+def update_dashboard(layout):
+    current_stats = stats.get_stats()
+    
+    for name, cell in layout.cells.items():
+        value = str(current_stats[name])
+        if cell.plain != value:
+            cell.plain = value
 
 def run_dashboard():
     layout = create_dashboard()
     
     with Live(layout, refresh_per_second=1, screen=True):
         while True:
-            update_dashboard(layout)
-            time.sleep(1)
+            next_tick = time.monotonic() + 1
+            if stats.changed.wait(timeout=1.0):
+                stats.changed.clear()
+                update_dashboard(layout)
+                time.sleep(max(0.0, next_tick - time.monotonic()))
+            else:
+                layout.cells["uptime"].plain = stats.get_uptime()
 
 if __name__ == '__main__':
     console.print(Panel.fit(
@@ -494,10 +741,17 @@ if __name__ == '__main__':
         border_style="red"
     ))
 
+    atexit.register(db.flush_usage_logs)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
     dashboard_thread = threading.Thread(target=run_dashboard, daemon=True)
     dashboard_thread.start()
     
     try:
-        app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
+        if PRODUCTION:
+            from gevent.pywsgi import WSGIServer
+            WSGIServer(('0.0.0.0', 5000), app).serve_forever()
+        else:
+            app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
     except KeyboardInterrupt:
         console.print("\n[yellow]Server shutting down...[/yellow]")